@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HarnessConfig:
     content_width: int = 960
     content_height: int = 720
@@ -42,3 +42,19 @@ class HarnessConfig:
     # - tesseract: require Tesseract
     ocr_backend: str = "auto"
     ocr_easyocr_gpu: bool = False
+    # Load the OCR model during reset() (while the game is still loading)
+    # instead of on the first state read.
+    ocr_warmup: bool = True
+    # Encoding for the content-only captures behind state reads (observe()
+    # screenshots are always full-viewport PNG).  "jpeg" encodes faster;
+    # "png" keeps OCR input lossless.
+    state_capture_format: str = "png"
+    state_capture_jpeg_quality: int = 90
+    # Persist HUD OCR results (keyed by crop pixel digest) across runs under
+    # this dir, one file per Ruffle build + resolved backend (+ EasyOCR mode).
+    # Off by default.
+    # observe() frames archived to run_dir always bypass the cache.
+    ocr_cache_dir: Optional[Path] = None
+    # Skip EasyOCR's text detector and recognize each HUD crop as one box.
+    # Faster, but readings may differ from the default detect+recognize path.
+    ocr_recognize_only: bool = False
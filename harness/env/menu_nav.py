@@ -8,21 +8,23 @@ WARNING: Tower prices may vary by difficulty/game version. Verify costs if affor
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from playwright.sync_api import Page  # pyright: ignore[reportMissingImports]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NavCoord:
     name: str
     x: float
     y: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UpgradeTier:
     name: str
     cost: int
@@ -53,7 +55,7 @@ TOWER_PAGE_2 = NavCoord("tower_page_2", 885, 469)
 _U = UpgradeTier  # shorthand
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TowerDef:
     name: str
     page: int        # 1 or 2
@@ -192,6 +194,11 @@ TOWERS = {
     # "exploding_pineapple" at (914, 520) — disabled
 }
 
+# Sidebar page tab to click before each tower's icon.
+_PAGE_BTN_FOR_TOWER = {
+    name: (TOWER_PAGE_1 if t.page == 1 else TOWER_PAGE_2) for name, t in TOWERS.items()
+}
+
 # ── Upgrade / sell UI ────────────────────────────────────────────
 UPGRADE_PATH_1 = NavCoord("upgrade_path_1", 558, 706)
 UPGRADE_PATH_2 = NavCoord("upgrade_path_2", 785, 706)
@@ -220,6 +227,39 @@ MONKEY_LANE_ZONES: list[Tuple[int, int, int, int]] = [
 
 TOWER_EXCLUSION_RADIUS = 40
 
+# Immutable copies for the validate_placement hot path.
+_ZONES: Tuple[Tuple[int, int, int, int], ...] = tuple(MONKEY_LANE_ZONES)
+_EXCLUSION_R2 = TOWER_EXCLUSION_RADIUS * TOWER_EXCLUSION_RADIUS
+
+# Uniform grid over placed towers.  With the cell size equal to the exclusion
+# radius, any tower closer than the radius lies in one of the 3x3 cells
+# around the candidate point.
+_GRID_CELL = TOWER_EXCLUSION_RADIUS
+_NEIGHBOUR_OFFSETS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+
+def _grid_cell(x: float, y: float) -> Tuple[int, int]:
+    return int(x // _GRID_CELL), int(y // _GRID_CELL)
+
+
+def grid_add(grid: dict, tower) -> None:
+    """Index a placed tower (anything with .x/.y) in a placement grid."""
+    grid.setdefault(_grid_cell(tower.x, tower.y), []).append(tower)
+
+
+def grid_remove(grid: dict, tower) -> None:
+    """Remove a tower previously added with grid_add."""
+    key = _grid_cell(tower.x, tower.y)
+    bucket = grid.get(key)
+    if bucket is None:
+        return
+    try:
+        bucket.remove(tower)
+    except ValueError:
+        return
+    if not bucket:
+        del grid[key]
+
 
 def next_upgrade(
     tower_name: str,
@@ -249,30 +289,44 @@ def validate_placement(
     y: float,
     placed_towers: dict,
     tower_name: str,
+    grid: Optional[dict] = None,
 ) -> Tuple[bool, str]:
     """Check whether (x, y) is a valid placement on Monkey Lane.
 
+    If ``grid`` (maintained with grid_add/grid_remove) is given, only towers
+    in the neighbouring cells are distance-checked instead of all of them.
+
     Returns (ok, reason).  reason is "" on success.
     """
-    import math
-
     # 1. Must be inside at least one valid zone
-    in_zone = any(
-        x1 <= x <= x2 and y1 <= y <= y2
-        for x1, y1, x2, y2 in MONKEY_LANE_ZONES
-    )
-    if not in_zone:
+    for x1, y1, x2, y2 in _ZONES:
+        if x1 <= x <= x2 and y1 <= y <= y2:
+            break
+    else:
         return False, (
             f"({x}, {y}) is not in any valid placement zone for Monkey Lane. "
             "Use 'status' to see valid zones and already-placed towers."
         )
 
-    # 2. Must be far enough from every existing tower
-    for t in placed_towers.values():
+    # 2. Must be far enough from every existing tower (squared distances;
+    #    the sqrt is only taken for the error message)
+    if grid is None:
+        candidates = placed_towers.values()
+    else:
+        cx, cy = _grid_cell(x, y)
+        candidates = [
+            t
+            for dx, dy in _NEIGHBOUR_OFFSETS
+            for t in grid.get((cx + dx, cy + dy), ())
+        ]
+        # Report the lowest-id conflict, same as scanning placed_towers in order
+        candidates.sort(key=lambda t: t.id)
+    for t in candidates:
         dx = x - t.x
         dy = y - t.y
-        dist = math.hypot(dx, dy)
-        if dist < TOWER_EXCLUSION_RADIUS:
+        d2 = dx * dx + dy * dy
+        if d2 < _EXCLUSION_R2:
+            dist = d2 ** 0.5
             return False, (
                 f"({x}, {y}) is too close to tower #{t.id} '{t.name}' at "
                 f"({t.x}, {t.y}) — distance {dist:.0f}px < {TOWER_EXCLUSION_RADIUS}px minimum. "
@@ -282,17 +336,47 @@ def validate_placement(
     return True, ""
 
 
-def _click(page: Page, coord: NavCoord, container_box: dict) -> None:
-    abs_x = container_box["x"] + coord.x
-    abs_y = container_box["y"] + coord.y
-    page.evaluate(f"window.__BLOONSBENCH__?.showDot({abs_x}, {abs_y})")
+# Constant source so the page compiles it once; coordinates travel as args.
+_SHOW_DOT_JS = "([x, y]) => window.__BLOONSBENCH__?.showDot(x, y)"
+
+
+def _click_abs(page: Page, abs_x: float, abs_y: float) -> None:
+    page.evaluate(_SHOW_DOT_JS, [abs_x, abs_y])
     page.mouse.click(abs_x, abs_y)
 
 
+def _click_xy(page: Page, x: float, y: float, container_box: dict) -> None:
+    """Click content-relative (x, y) without wrapping it in a NavCoord."""
+    _click_abs(page, container_box["x"] + x, container_box["y"] + y)
+
+
+def _click(page: Page, coord: NavCoord, container_box: dict) -> None:
+    _click_xy(page, coord.x, coord.y, container_box)
+
+
+# Container boxes keyed by page.  The #container div is fixed-size and only
+# moves if the page navigates, so one layout query per page load is enough.
+_box_cache: "WeakKeyDictionary[Page, dict]" = WeakKeyDictionary()
+_box_listeners: "WeakKeyDictionary[Page, bool]" = WeakKeyDictionary()
+
+
+def _ensure_listener(page: Page) -> None:
+    """Drop the cached box whenever the page navigates (registered once per page)."""
+    if page in _box_listeners:
+        return
+    page.on("framenavigated", lambda _frame: _box_cache.pop(page, None))
+    _box_listeners[page] = True
+
+
 def _get_container_box(page: Page) -> dict:
+    box = _box_cache.get(page)
+    if box is not None:
+        return box
     box = page.locator("div#container").first.bounding_box()
     if not box:
         raise RuntimeError("Container bounding box not available")
+    _ensure_listener(page)
+    _box_cache[page] = box
     return box
 
 
@@ -307,33 +391,47 @@ def navigate_to_round(
 
     Returns list of screenshot paths (empty if screenshot_dir is None).
     """
-    if map_name not in MAPS:
+    map_coord = MAPS.get(map_name)
+    if map_coord is None:
         raise ValueError(f"Unknown map: {map_name!r}. Known: {list(MAPS)}")
-    if difficulty not in DIFFICULTIES:
+    diff_coord = DIFFICULTIES.get(difficulty)
+    if diff_coord is None:
         raise ValueError(f"Unknown difficulty: {difficulty!r}. Known: {list(DIFFICULTIES)}")
 
+    sequence = [
+        ("dismiss_offline", DISMISS_OFFLINE),
+        ("dismiss_dialog", DIALOG_DISMISS),
+        ("play", PLAY_BUTTON),
+        (f"map_{map_name}", map_coord),
+        (f"diff_{difficulty}", diff_coord),
+        ("start", START_GAME),
+        ("close_premium", CLOSE_PREMIUM),
+    ]
+
+    # Resolve every step to page-absolute coords once, up front.
     box = _get_container_box(page)
+    bx, by = box["x"], box["y"]
+    steps = [(name, bx + c.x, by + c.y) for name, c in sequence]
+
+    delay_ms = int(step_delay_s * 1000)
+    if screenshot_dir:
+        screenshot_dir.mkdir(parents=True, exist_ok=True)
     screenshots: list[Path] = []
-    step_idx = 0
-
-    def _step(name: str, coord: NavCoord) -> None:
-        nonlocal step_idx
-        _click(page, coord, box)
-        page.wait_for_timeout(int(step_delay_s * 1000))
-        if screenshot_dir:
-            screenshot_dir.mkdir(parents=True, exist_ok=True)
-            path = screenshot_dir / f"nav_{step_idx:02d}_{name}.png"
-            page.screenshot(path=str(path), full_page=True)
-            screenshots.append(path)
-        step_idx += 1
-
-    _step("dismiss_offline", DISMISS_OFFLINE)
-    _step("dismiss_dialog", DIALOG_DISMISS)
-    _step("play", PLAY_BUTTON)
-    _step(f"map_{map_name}", MAPS[map_name])
-    _step(f"diff_{difficulty}", DIFFICULTIES[difficulty])
-    _step("start", START_GAME)
-    _step("close_premium", CLOSE_PREMIUM)
+
+    # Debug screenshots are written to disk on a worker thread so the next
+    # click isn't held up by file I/O; all writes finish before returning,
+    # and a failed write raises here just as page.screenshot(path=...) would.
+    pending = []
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for step_idx, (name, abs_x, abs_y) in enumerate(steps):
+            _click_abs(page, abs_x, abs_y)
+            page.wait_for_timeout(delay_ms)
+            if screenshot_dir:
+                path = screenshot_dir / f"nav_{step_idx:02d}_{name}.png"
+                pending.append(writer.submit(path.write_bytes, page.screenshot(full_page=True)))
+                screenshots.append(path)
+    for fut in pending:
+        fut.result()
 
     return screenshots
 
@@ -349,15 +447,14 @@ def place_tower(
 
     Coordinates are content-relative (960x720).
     """
-    if tower_name not in TOWERS:
+    tower = TOWERS.get(tower_name)
+    if tower is None:
         raise ValueError(f"Unknown tower: {tower_name!r}. Known: {list(TOWERS)}")
 
-    tower = TOWERS[tower_name]
     box = _get_container_box(page)
 
     # Click the correct page tab
-    page_btn = TOWER_PAGE_1 if tower.page == 1 else TOWER_PAGE_2
-    _click(page, page_btn, box)
+    _click(page, _PAGE_BTN_FOR_TOWER[tower_name], box)
     page.wait_for_timeout(int(click_delay_s * 1000))
 
     # Click the tower icon
@@ -365,7 +462,7 @@ def place_tower(
     page.wait_for_timeout(int(click_delay_s * 1000))
 
     # Click the map to place it
-    _click(page, NavCoord(f"place_{tower_name}", x, y), box)
+    _click_xy(page, x, y, box)
     page.wait_for_timeout(int(click_delay_s * 1000))
 
     # Deselect so the info panel closes
@@ -376,7 +473,7 @@ def place_tower(
 def select_tower_at(page: Page, x: float, y: float, click_delay_s: float = 0.3) -> None:
     """Click a placed tower on the map to open its info panel."""
     box = _get_container_box(page)
-    _click(page, NavCoord("select_tower", x, y), box)
+    _click_xy(page, x, y, box)
     page.wait_for_timeout(int(click_delay_s * 1000))
 
 
@@ -399,11 +496,11 @@ def click_sell(page: Page, click_delay_s: float = 0.3) -> None:
 
 def click_target(page: Page, target: str, click_delay_s: float = 0.3) -> None:
     """Click a targeting mode button (tower must already be selected)."""
-    target = target.lower()
-    if target not in TARGETS:
-        raise ValueError(f"Unknown target: {target!r}. Options: {list(TARGETS)}")
+    coord = TARGETS.get(target.lower())
+    if coord is None:
+        raise ValueError(f"Unknown target: {target.lower()!r}. Options: {list(TARGETS)}")
     box = _get_container_box(page)
-    _click(page, TARGETS[target], box)
+    _click(page, coord, box)
     page.wait_for_timeout(int(click_delay_s * 1000))
 
 
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import re
+
 from playwright.sync_api import Page, Route
 
-_BLOCKED_PATTERNS = [
-    "*ninjakiwi.com*",
-    "*nkstatic.com*",
-    "*nkgames.com*",
-]
+_BLOCKED_DOMAINS = ("ninjakiwi.com", "nkstatic.com", "nkgames.com")
+
+# One route for all domains instead of one glob per domain.  This matches
+# exactly what the original "*<domain>*" globs did (Playwright's "*" does not
+# cross "/"), keeping the network environment existing runs were recorded
+# under; widening it to real host matching is a benchmark-visible change.
+_BLOCKED_RE = re.compile(
+    r"^[^/]*(?:" + "|".join(re.escape(d) for d in _BLOCKED_DOMAINS) + r")[^/]*$"
+)
 
 
 def _abort_handler(route: Route) -> None:
@@ -17,5 +23,4 @@ def _abort_handler(route: Route) -> None:
 
 def block_nk_domains(page: Page) -> None:
     """Must be called before page.goto()."""
-    for pattern in _BLOCKED_PATTERNS:
-        page.route(pattern, _abort_handler)
+    page.route(_BLOCKED_RE, _abort_handler)
@@ -2,23 +2,29 @@
 
 from __future__ import annotations
 
-import tempfile
+import io
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Iterator, Mapping, Optional
 
-from playwright.sync_api import BrowserContext, Page, sync_playwright
+from playwright.sync_api import BrowserContext, Page, Playwright, sync_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from harness.env.config import HarnessConfig
 from harness.env.network import block_nk_domains
 from harness.env.save_data import import_saves_from_file
 from harness.env.menu_nav import (
-    TOWERS, GO_BUTTON, DESELECT_SPOT, NavCoord,
+    TOWERS, GO_BUTTON, DESELECT_SPOT,
     navigate_to_round, place_tower, validate_placement, next_upgrade,
+    grid_add, grid_remove,
     select_tower_at, click_upgrade, click_sell, click_target, deselect,
-    _get_container_box, _click,
+    _get_container_box, _click, _click_xy,
 )
 from harness.perception.cash_ocr import GameStateReader, GameState, OK_CLICK_TARGET
 from harness.runtime.local_http import LocalServer, serve_directory
@@ -30,18 +36,41 @@ def _ts() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
-@dataclass
+# Keep the game running at full speed when the (headful) window is hidden
+# or unfocused, and skip audio output.  GPU stays enabled so Ruffle renders
+# the same way it always has.
+_CHROMIUM_ARGS = [
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--mute-audio",
+]
+
+
+@lru_cache(maxsize=16)
+def _wrapper_html(wrapper_src: Path, content_width: int, content_height: int, mtime_ns: int) -> bytes:
+    """Ruffle wrapper page sized for the given content, encoded and ready to write.
+
+    mtime_ns is part of the cache key so edits to the template are picked up.
+    """
+    wrapper_text = wrapper_src.read_text(encoding="utf-8")
+    wrapper_text = wrapper_text.replace("960px", f"{content_width}px").replace("720px", f"{content_height}px")
+    return wrapper_text.encode("utf-8")
+
+
+@dataclass(slots=True)
 class PlacedTower:
     """Tracks a tower that has been placed on the map."""
     id: int
     name: str
     x: float
     y: float
-    upgrades: list  # [path1_level, path2_level]
-    target: str = "first"  # first, last, close, strong
+    # Mutable per-run bookkeeping; identity is (id, name, x, y)
+    upgrades: list = field(compare=False)  # [path1_level, path2_level]
+    target: str = field(default="first", compare=False)  # first, last, close, strong
 
 
-@dataclass
+@dataclass(slots=True)
 class BloonsWebEnv:
     repo_root: Path
     swf_path: Path
@@ -50,15 +79,18 @@ class BloonsWebEnv:
     run_dir: Optional[Path] = None
     logger: Optional[TraceLogger] = None
     server: Optional[LocalServer] = None
-    _pw = None
+    _pw: Optional[Playwright] = None
     ctx: Optional[BrowserContext] = None
     page: Optional[Page] = None
 
     # Tower tracking
     _next_tower_id: int = 1
     _placed_towers: Dict[int, PlacedTower] = field(default_factory=dict)
+    _tower_grid: dict = field(default_factory=dict)  # placement grid over _placed_towers
     _state_reader: Optional[GameStateReader] = None
     _last_game_state: GameState = field(default_factory=GameState)
+    _state_dirty: bool = False  # an action ran since _last_game_state was read
+    _state_ts: float = 0.0  # time.monotonic() of the last state read
 
     def _wait_for_main_menu_ready(self, max_wait_s: float = 60.0, poll_interval_ms: int = 1000) -> bool:
         """Poll for main menu text (e.g. 'Play As Guest') to appear via OCR.
@@ -66,50 +98,44 @@ class BloonsWebEnv:
         Returns True if menu detected, False if timeout.
         Region: screenshot (438,516)→(633,555), content-relative (369,481,195,39).
         """
-        import tempfile
-        try:
-            from PIL import Image
-            import numpy as np
-            import easyocr
-        except ImportError:
+        if not GameStateReader.has_easyocr():
             # Fallback to time-based wait if OCR not available
             self.logger.log("main_menu_wait_fallback", reason="OCR not available")
-            self.page.wait_for_timeout(int(self.cfg.startup_wait_s * 1000))
+            self.page.wait_for_timeout(int(max_wait_s * 1000))
             return True
+        from PIL import Image
+        import numpy as np
 
         # Content-relative region for "Play As Guest" button
         # Screenshot coords (438,516)→(633,555), container offset ~(69,35)
         # → content-relative (369, 481, 195, 39)
         region_x, region_y, region_w, region_h = 369, 481, 195, 39
 
-        reader = easyocr.Reader(["en"], gpu=self.cfg.ocr_easyocr_gpu, verbose=False)
-        start_time = time.time()
+        # Share the state reader's model instead of loading a second copy
+        reader = self._get_reader()._get_easyocr_reader()
+        start_time = time.monotonic()
 
-        while (time.time() - start_time) < max_wait_s:
+        while (time.monotonic() - start_time) < max_wait_s:
             try:
-                # Take screenshot and crop to button region
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                    tmp_path = tmp.name
-
-                self._capture_screenshot(tmp_path)
+                # Capture just the button region
                 box = _get_container_box(self.page)
-
-                img = Image.open(tmp_path)
-                # Crop to content area first, then to button region
-                content_crop = img.crop((box["x"], box["y"], box["x"] + box["width"], box["y"] + box["height"]))
-                button_crop = content_crop.crop((region_x, region_y, region_x + region_w, region_y + region_h))
+                data = self.page.screenshot(
+                    clip={"x": box["x"] + region_x, "y": box["y"] + region_y,
+                          "width": region_w, "height": region_h},
+                    animations="disabled",
+                    caret="hide",
+                    scale="css",
+                )
+                button_crop = Image.open(io.BytesIO(data))
 
                 # Run OCR on button region
                 arr = np.array(button_crop)
                 results = reader.readtext(arr, detail=1, paragraph=False)
 
-                # Clean up temp file
-                Path(tmp_path).unlink(missing_ok=True)
-
                 # If we detect any text, main menu is ready
                 if results and len(results) > 0:
                     detected_text = " ".join(str(r[1]) for r in results if len(r) >= 2)
-                    self.logger.log("main_menu_ready", text=detected_text, elapsed_s=round(time.time() - start_time, 2))
+                    self.logger.log("main_menu_ready", text=detected_text, elapsed_s=round(time.monotonic() - start_time, 2))
                     return True
 
             except Exception as e:
@@ -127,7 +153,10 @@ class BloonsWebEnv:
         # Reset tower tracking
         self._next_tower_id = 1
         self._placed_towers = {}
+        self._tower_grid = {}
         self._last_game_state = GameState()
+        self._state_dirty = False
+        self._state_ts = 0.0
 
         out_root = (out_root or (self.repo_root / "logs" / "runs")).resolve()
         self.run_dir = out_root / _ts()
@@ -136,22 +165,25 @@ class BloonsWebEnv:
         self.logger = TraceLogger(self.run_dir)
         self.logger.log("reset", swf=str(self.swf_path), ruffle_tag=self.cfg.ruffle_tag)
 
+        # Load the OCR model in the background while the browser and game
+        # start; the first OCR call blocks on it if it isn't done yet.
+        if self.cfg.ocr_warmup:
+            threading.Thread(target=self._get_reader().warmup, name="ocr-warmup", daemon=True).start()
+
         ruffle = ensure_ruffle_web(self.repo_root, tag=self.cfg.ruffle_tag)
 
-        # Stage www directory with symlinked Ruffle assets
+        # Stage www directory; the vendored Ruffle build is linked in whole
         www = self.run_dir / "www"
         www.mkdir(parents=True, exist_ok=True)
-        for p in ruffle.dir.iterdir():
-            if p.is_file():
-                dest = www / p.name
-                if not dest.exists():
-                    dest.symlink_to(p)
+        ruffle_link = www / "ruffle"
+        if not ruffle_link.exists():
+            ruffle_link.symlink_to(ruffle.dir, target_is_directory=True)
 
         # Copy wrapper and apply content dimensions
         wrapper_src = self.repo_root / "harness" / "runtime" / "ruffle_wrapper.html"
-        wrapper_text = wrapper_src.read_text(encoding="utf-8")
-        wrapper_text = wrapper_text.replace("960px", f"{self.cfg.content_width}px").replace("720px", f"{self.cfg.content_height}px")
-        (www / "index.html").write_text(wrapper_text, encoding="utf-8")
+        (www / "index.html").write_bytes(_wrapper_html(
+            wrapper_src, self.cfg.content_width, self.cfg.content_height, wrapper_src.stat().st_mtime_ns,
+        ))
 
         game_link = www / "game.swf"
         if not game_link.exists():
@@ -178,6 +210,7 @@ class BloonsWebEnv:
             user_data_dir=str(profile_dir),
             headless=self.cfg.headless,
             viewport={"width": self.cfg.viewport_width, "height": self.cfg.viewport_height},
+            args=_CHROMIUM_ARGS,
         )
         self.page = self.ctx.new_page()
 
@@ -197,8 +230,26 @@ class BloonsWebEnv:
             self.page.evaluate("window.__BLOONSBENCH__.loadGame()")
             self.logger.log("deferred_load_triggered")
 
+        # Don't start OCR polling until Ruffle reports the SWF is loaded;
+        # before that there is nothing on screen to read.  Both waits share
+        # startup_wait_s, and the load signal gets at most half of it so a
+        # build that never fires it still leaves the poll real time.
+        ready_wait_s = self.cfg.startup_wait_s / 2
+        t0 = time.monotonic()
+        if ready_wait_s > 0:  # Playwright treats timeout=0 as "wait forever"
+            try:
+                self.page.wait_for_function(
+                    "window.__BLOONSBENCH__.ready === true",
+                    timeout=ready_wait_s * 1000,
+                )
+                self.logger.log("swf_loaded", elapsed_s=round(time.monotonic() - t0, 2))
+            except PlaywrightTimeoutError:
+                # No load signal (e.g. older Ruffle); let the OCR poll decide.
+                self.logger.log("swf_loaded_timeout", max_wait_s=ready_wait_s)
+        menu_wait_s = max(1.0, self.cfg.startup_wait_s - (time.monotonic() - t0))
+
         # Wait for main menu to appear (OCR-based detection with fallback)
-        self._wait_for_main_menu_ready(max_wait_s=self.cfg.startup_wait_s)
+        self._wait_for_main_menu_ready(max_wait_s=menu_wait_s)
         self.observe(tag="startup")
 
         if self.cfg.auto_navigate_to_round:
@@ -215,11 +266,27 @@ class BloonsWebEnv:
 
     # ── Screenshot + OCR core ────────────────────────────────────────
 
-    def _capture_screenshot(self, path: str | Path) -> None:
-        """Capture viewport screenshot with options that reduce headful jitter."""
+    def _capture_screenshot(self, path: str | Path | None = None) -> bytes:
+        """Capture viewport screenshot with options that reduce headful jitter.
+
+        Returns the PNG bytes; also writes them to ``path`` when given.
+        """
         assert self.page
-        self.page.screenshot(
-            path=str(path),
+        return self.page.screenshot(
+            path=str(path) if path is not None else None,
+            animations="disabled",
+            caret="hide",
+            scale="css",
+        )
+
+    def _capture_content(self, box: dict) -> bytes:
+        """Capture only the game container, for OCR that never needs the rest of the viewport."""
+        assert self.page
+        fmt = self.cfg.state_capture_format
+        return self.page.screenshot(
+            type=fmt,
+            quality=self.cfg.state_capture_jpeg_quality if fmt == "jpeg" else None,
+            clip={"x": box["x"], "y": box["y"], "width": box["width"], "height": box["height"]},
             animations="disabled",
             caret="hide",
             scale="css",
@@ -228,100 +295,124 @@ class BloonsWebEnv:
     def _get_reader(self) -> GameStateReader:
         if self._state_reader is None:
             debug_dir = self.run_dir / "ocr_debug" if self.run_dir else None
+            cache_dir = None
+            if self.cfg.ocr_cache_dir:
+                cache_dir = Path(self.cfg.ocr_cache_dir).expanduser().resolve()
             self._state_reader = GameStateReader(
                 debug_dir=debug_dir,
                 backend=self.cfg.ocr_backend,
                 easyocr_gpu=self.cfg.ocr_easyocr_gpu,
+                cache_dir=cache_dir,
+                cache_tag=self.cfg.ruffle_tag,
+                recognize_only=self.cfg.ocr_recognize_only,
             )
         return self._state_reader
 
-    def _update_state(self, screenshot_path: str | Path | None = None) -> None:
-        """Take a screenshot (or reuse one), run OCR + OK detection, cache result.
+    def _dismiss_ok(self, box: dict) -> None:
+        """Click the OK button of a detected dialog and let the screen settle."""
+        cx, cy = OK_CLICK_TARGET
+        _click_xy(self.page, cx, cy, box)
+        self.page.wait_for_timeout(300)
+        if self.logger:
+            self.logger.log("auto_dismiss_ok")
 
-        If screenshot_path is provided, uses that image (no new screenshot).
-        Otherwise takes a temp screenshot, processes it, and deletes it.
-        """
+    def _update_state(self) -> None:
+        """Take an in-memory content capture, run OCR + OK detection, cache result."""
         assert self.page
         box = _get_container_box(self.page)
         reader = self._get_reader()
+        origin = {"x": 0, "y": 0}  # the capture starts at the container corner
 
-        cleanup = False
-        if screenshot_path is None:
-            tmp = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-            screenshot_path = tmp.name
-            tmp.close()
-            self._capture_screenshot(screenshot_path)
-            cleanup = True
-
-        state, ok_detected = reader.update(str(screenshot_path), box)
+        state, ok_detected = reader.update_bytes(self._capture_content(box), origin)
 
         if ok_detected:
-            cx, cy = OK_CLICK_TARGET
-            _click(self.page, NavCoord("dismiss_ok", cx, cy), box)
-            self.page.wait_for_timeout(300)
-            if self.logger:
-                self.logger.log("auto_dismiss_ok")
+            self._dismiss_ok(box)
             # Retake + re-read after dismissal
-            if cleanup:
-                Path(screenshot_path).unlink(missing_ok=True)
-            tmp = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-            screenshot_path = tmp.name
-            tmp.close()
-            self._capture_screenshot(screenshot_path)
-            cleanup = True
-            state, _ = reader.update(str(screenshot_path), box)
-
-        if cleanup:
-            Path(screenshot_path).unlink(missing_ok=True)
+            state, _ = reader.update_bytes(self._capture_content(box), origin)
 
         self._last_game_state = state
+        self._state_dirty = False
+        self._state_ts = time.monotonic()
 
     def observe(self, tag: str = "obs") -> Path:
         """Take a screenshot, run OCR + OK detection from it, return path."""
         assert self.page and self.logger and self.run_dir
         fname = f"{tag}_{int(time.time()*1000)}.png"
         out = self.run_dir / fname
-        self._capture_screenshot(out)
+        data = self._capture_screenshot(out)
 
-        # Run OCR + OK detection on this same screenshot (no extra screenshot)
+        # Run OCR + OK detection on this same screenshot (no extra screenshot,
+        # and no re-reading the file we just wrote).  Archived frames always
+        # get a real OCR pass so the trace reflects what the engine read.
         box = _get_container_box(self.page)
-        state, ok_detected = self._get_reader().update(str(out), box)
+        state, ok_detected = self._get_reader().update_bytes(data, box, use_cache=False)
 
         if ok_detected:
-            cx, cy = OK_CLICK_TARGET
-            _click(self.page, NavCoord("dismiss_ok", cx, cy), box)
-            self.page.wait_for_timeout(300)
-            if self.logger:
-                self.logger.log("auto_dismiss_ok")
+            self._dismiss_ok(box)
             # Retake since dialog changed the screen
-            self._capture_screenshot(out)
-            state, _ = self._get_reader().update(str(out), box)
+            data = self._capture_screenshot(out)
+            state, _ = self._get_reader().update_bytes(data, box, use_cache=False)
 
         self._last_game_state = state
+        self._state_dirty = False
+        self._state_ts = time.monotonic()
         self.logger.log("screenshot", tag=tag, path=fname)
         return out
 
+    def _fresh_cash(self, max_age_s: float = 0.5) -> int | None:
+        """Return cash read within the last max_age_s.
+
+        When the cached state is too old, only the cash field is re-read; an
+        OK dialog falls back to the full _update_state() so it gets dismissed.
+        """
+        if not self._state_dirty and time.monotonic() - self._state_ts < max_age_s:
+            return self._last_game_state.cash
+        box = _get_container_box(self.page)
+        cash, ok_detected = self._get_reader().read_cash_bytes(self._capture_content(box), {"x": 0, "y": 0})
+        if ok_detected:
+            self._update_state()
+            return self._last_game_state.cash
+        return cash
+
+    def _flush_state(self) -> None:
+        """Re-read state if an action ran since the last read.
+
+        Called before clicking into the game, because _update_state() is also
+        what dismisses an OK dialog that would otherwise swallow the click.
+        """
+        if self._state_dirty:
+            self._update_state()
+
     def read_game_state(self) -> GameState:
-        """Return the cached game state from the last screenshot."""
+        """Return the game state, re-reading the screen only if an action ran since."""
+        self._flush_state()
         return self._last_game_state
 
     def read_cash(self) -> int | None:
-        """Return cached cash from the last screenshot."""
-        return self._last_game_state.cash
+        """Return cash, re-reading the screen only if an action ran since."""
+        return self.read_game_state().cash
 
-    # ── Actions (each followed by _update_state) ─────────────────────
+    @contextmanager
+    def batch_actions(self) -> Iterator[None]:
+        """Run several actions back to back, then refresh game state once."""
+        try:
+            yield
+        finally:
+            if self.page:
+                self._flush_state()
+
+    # ── Actions ───────────────────────────────────────────────────────
+    # sell_tower/set_target only mark state dirty; every action that clicks
+    # into the game flushes pending state first so OK dialogs are dismissed.
 
     def click_content(self, x: float, y: float) -> None:
         """Click at coordinates relative to the content container."""
         assert self.page and self.logger
-        box = self.page.locator("div#container").first.bounding_box()
-        if not box:
-            raise RuntimeError("Container bounding box not available")
-        abs_x = box["x"] + x
-        abs_y = box["y"] + y
-        self.logger.log("click", x=x, y=y, abs_x=abs_x, abs_y=abs_y)
-        self.page.evaluate(f"window.__BLOONSBENCH__?.showDot({abs_x}, {abs_y})")
-        self.page.mouse.click(abs_x, abs_y)
+        self._flush_state()
+        box = _get_container_box(self.page)
+        self.logger.log("click", x=x, y=y, abs_x=box["x"] + x, abs_y=box["y"] + y)
+        _click_xy(self.page, x, y, box)
+        # Eager: this is the escape hatch for stuck UI, so dismiss dialogs now.
         self._update_state()
 
     def place_tower(self, tower_name: str, x: float, y: float) -> int:
@@ -331,16 +422,15 @@ class BloonsWebEnv:
         Raises ValueError if the placement is invalid (off-zone or too close).
         """
         assert self.page and self.logger
-        if tower_name not in TOWERS:
+        tower_def = TOWERS.get(tower_name)
+        if tower_def is None:
             raise ValueError(f"Unknown tower: {tower_name!r}. Known: {list(TOWERS)}")
-        ok, reason = validate_placement(x, y, self._placed_towers, tower_name)
+        ok, reason = validate_placement(x, y, self._placed_towers, tower_name, self._tower_grid)
         if not ok:
             raise ValueError(reason)
-        tower_def = TOWERS[tower_name]
 
-        # Fresh OCR to get authoritative cash before attempting placement
-        self._update_state()
-        cash_before = self._last_game_state.cash
+        # Recent OCR for authoritative cash before attempting placement
+        cash_before = self._fresh_cash()
 
         # Affordability check using fresh cash
         if cash_before is not None and cash_before < tower_def.cost:
@@ -353,9 +443,9 @@ class BloonsWebEnv:
         self._next_tower_id += 1
         self.logger.log("place_tower", tower=tower_name, x=x, y=y, tower_id=tid)
         place_tower(self.page, tower_name, x, y)
-        self._placed_towers[tid] = PlacedTower(
-            id=tid, name=tower_name, x=x, y=y, upgrades=[0, 0],
-        )
+        placed = PlacedTower(id=tid, name=tower_name, x=x, y=y, upgrades=[0, 0])
+        self._placed_towers[tid] = placed
+        grid_add(self._tower_grid, placed)
         self._update_state()
         cash_after = self._last_game_state.cash
 
@@ -363,6 +453,7 @@ class BloonsWebEnv:
             # Cash didn't change at all — placement almost certainly failed.
             # (Both None, or both the same number.)
             del self._placed_towers[tid]
+            grid_remove(self._tower_grid, placed)
             self._next_tower_id -= 1
             # Cancel any dangling placement cursor
             box = _get_container_box(self.page)
@@ -401,15 +492,13 @@ class BloonsWebEnv:
                 f"(current: {tower.upgrades[0]}/{tower.upgrades[1]}). "
                 "Only one path can go past tier 2."
             )
-        cash = self.read_cash()
-        if cash is not None and cash < nxt.cost:
+        # Recent OCR for authoritative cash before upgrade
+        cash_before = self._fresh_cash()
+        if cash_before is not None and cash_before < nxt.cost:
             raise ValueError(
-                f"Cannot afford {nxt.name} (${nxt.cost}), current cash: ${cash}. "
+                f"Cannot afford {nxt.name} (${nxt.cost}), current cash: ${cash_before}. "
                 "Use 'status' to check cash, or sell a tower first."
             )
-        # Fresh OCR to get authoritative cash before upgrade
-        self._update_state()
-        cash_before = self._last_game_state.cash
 
         self.logger.log("upgrade_tower", tower_id=tower_id, path=path,
                         name=tower.name, before=list(tower.upgrades))
@@ -442,10 +531,12 @@ class BloonsWebEnv:
             raise ValueError(f"No tower with id {tower_id}. Placed: {list(self._placed_towers)}")
         tower = self._placed_towers[tower_id]
         self.logger.log("sell_tower", tower_id=tower_id, name=tower.name)
+        self._flush_state()
         select_tower_at(self.page, tower.x, tower.y)
         click_sell(self.page)
         del self._placed_towers[tower_id]
-        self._update_state()
+        grid_remove(self._tower_grid, tower)
+        self._state_dirty = True
 
     def set_target(self, tower_id: int, target: str) -> None:
         """Set targeting mode for a placed tower (first/last/close/strong)."""
@@ -454,15 +545,16 @@ class BloonsWebEnv:
             raise ValueError(f"No tower with id {tower_id}. Placed: {list(self._placed_towers)}")
         tower = self._placed_towers[tower_id]
         self.logger.log("set_target", tower_id=tower_id, target=target, name=tower.name)
+        self._flush_state()
         select_tower_at(self.page, tower.x, tower.y)
         click_target(self.page, target)
         tower.target = target.lower()
         deselect(self.page)
-        self._update_state()
+        self._state_dirty = True
 
-    def get_placed_towers(self) -> Dict[int, PlacedTower]:
-        """Return the current placed towers dict."""
-        return dict(self._placed_towers)
+    def get_placed_towers(self) -> Mapping[int, PlacedTower]:
+        """Return a read-only live view of the placed towers (dict() it for a snapshot)."""
+        return MappingProxyType(self._placed_towers)
 
     def press(self, key: str) -> None:
         assert self.page and self.logger
@@ -474,6 +566,7 @@ class BloonsWebEnv:
         """Click GO twice (short delay) to start round on fast-forward, then wait 7s."""
         assert self.page and self.logger
         self.logger.log("start_round")
+        self._flush_state()
         box = _get_container_box(self.page)
         _click(self.page, GO_BUTTON, box)
         self.page.wait_for_timeout(300)
@@ -502,9 +595,15 @@ class BloonsWebEnv:
                 self.logger.close()
             except Exception:
                 pass
+        if self._state_reader:
+            try:
+                self._state_reader.close()
+            except Exception:
+                pass
 
         self.ctx = None
         self.page = None
         self._pw = None
         self.server = None
         self.logger = None
+        self._state_reader = None
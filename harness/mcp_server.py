@@ -4,7 +4,7 @@ JSON-RPC 2.0 over newline-delimited JSON on stdin/stdout.
 Takes an already-initialized BloonsWebEnv — game must be ready before
 the server starts accepting commands.
 
-Zero new dependencies beyond the stdlib.
+Zero new dependencies beyond the stdlib (orjson is used when installed).
 """
 
 from __future__ import annotations
@@ -13,11 +13,32 @@ import base64
 import json
 import sys
 import time
+from functools import lru_cache
 from typing import Any
 
 from harness.env.web_env import BloonsWebEnv
 from harness.env.menu_nav import TOWERS, next_upgrade
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+
+def _dumps(msg: dict) -> bytes:
+    if _HAS_ORJSON:
+        return orjson.dumps(msg)
+    return json.dumps(msg).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    if _HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 PROTOCOL_VERSION = "2024-11-05"
 
 SERVER_INFO = {
@@ -236,7 +257,9 @@ def _format_path(upgrades: tuple) -> str:
     return " > ".join(f"{u.name} ${u.cost}" for u in upgrades)
 
 
+@lru_cache(maxsize=None)
 def _format_tower_list() -> str:
+    """Tower catalogue text; TOWERS is static, so this is built once."""
     lines = ["Available towers:"]
     for name, t in TOWERS.items():
         lines.append(f"  {name} (${t.cost})")
@@ -245,8 +268,25 @@ def _format_tower_list() -> str:
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=None)
+def _upgrade_summary(name: str, lvl1: int, lvl2: int) -> tuple[str, str, str, str]:
+    """(path1 current, path2 current, path1 next, path2 next) for a tower state.
+
+    Pure function of static tower data, so each (tower, levels) combo is
+    formatted once.
+    """
+    tdef = TOWERS.get(name)
+    p1_cur = tdef.path1[lvl1 - 1].name if tdef and lvl1 > 0 else "base"
+    p2_cur = tdef.path2[lvl2 - 1].name if tdef and lvl2 > 0 else "base"
+    nxt1 = next_upgrade(name, 1, lvl1, other_path_level=lvl2)
+    nxt2 = next_upgrade(name, 2, lvl2, other_path_level=lvl1)
+    p1_str = f"{nxt1.name} ${nxt1.cost}" if nxt1 else "LOCKED" if lvl2 > 2 and lvl1 < 4 else "MAXED"
+    p2_str = f"{nxt2.name} ${nxt2.cost}" if nxt2 else "LOCKED" if lvl1 > 2 and lvl2 < 4 else "MAXED"
+    return p1_cur, p2_cur, p1_str, p2_str
+
+
 def _format_status(env: BloonsWebEnv) -> str:
-    gs = env.read_game_state()  # cached — no screenshot
+    gs = env.read_game_state()  # cached unless an action ran since
     cash_str = f"${gs.cash}" if gs.cash is not None else "unknown"
     lives_str = str(gs.lives) if gs.lives is not None else "unknown"
     round_str = str(gs.round_num) if gs.round_num is not None else "unknown"
@@ -257,21 +297,13 @@ def _format_status(env: BloonsWebEnv) -> str:
         return "\n".join(lines)
     lines.append("Placed towers:")
     for tid, t in sorted(towers.items()):
-        tdef = TOWERS.get(t.name)
-        # Current upgrade names
-        p1_cur = tdef.path1[t.upgrades[0] - 1].name if tdef and t.upgrades[0] > 0 else "base"
-        p2_cur = tdef.path2[t.upgrades[1] - 1].name if tdef and t.upgrades[1] > 0 else "base"
+        p1_cur, p2_cur, p1_str, p2_str = _upgrade_summary(t.name, t.upgrades[0], t.upgrades[1])
         lines.append(
             f"  #{tid} {t.name} at ({t.x}, {t.y})"
             f"  [{t.upgrades[0]}/{t.upgrades[1]}]"
             f"  target={t.target}"
             f"  (path1: {p1_cur}, path2: {p2_cur})"
         )
-        # Next available upgrades
-        nxt1 = next_upgrade(t.name, 1, t.upgrades[0], other_path_level=t.upgrades[1])
-        nxt2 = next_upgrade(t.name, 2, t.upgrades[1], other_path_level=t.upgrades[0])
-        p1_str = f"{nxt1.name} ${nxt1.cost}" if nxt1 else "LOCKED" if t.upgrades[1] > 2 and t.upgrades[0] < 4 else "MAXED"
-        p2_str = f"{nxt2.name} ${nxt2.cost}" if nxt2 else "LOCKED" if t.upgrades[0] > 2 and t.upgrades[1] < 4 else "MAXED"
         lines.append(f"      next: path1 → {p1_str}  |  path2 → {p2_str}")
     return "\n".join(lines)
 
@@ -337,17 +369,20 @@ def handle_tool_call(env: BloonsWebEnv, name: str, args: dict) -> dict:
         return {"content": _error_content(str(e)), "isError": True}
 
 
+def _write_message(msg: dict) -> None:
+    """Write one newline-delimited JSON message straight to the stdout byte stream."""
+    out = sys.stdout.buffer
+    out.write(_dumps(msg) + b"\n")
+    out.flush()
+
+
 def _respond(id: Any, result: dict) -> None:
     """Write a JSON-RPC response to stdout."""
-    msg = {"jsonrpc": "2.0", "id": id, "result": result}
-    sys.stdout.write(json.dumps(msg) + "\n")
-    sys.stdout.flush()
+    _write_message({"jsonrpc": "2.0", "id": id, "result": result})
 
 
 def _error_response(id: Any, code: int, message: str) -> None:
-    msg = {"jsonrpc": "2.0", "id": id, "error": {"code": code, "message": message}}
-    sys.stdout.write(json.dumps(msg) + "\n")
-    sys.stdout.flush()
+    _write_message({"jsonrpc": "2.0", "id": id, "error": {"code": code, "message": message}})
 
 
 def run_server(env: BloonsWebEnv) -> None:
@@ -359,14 +394,16 @@ def run_server(env: BloonsWebEnv) -> None:
     sys.stderr.write("MCP server ready — reading from stdin\n")
     sys.stderr.flush()
 
-    for line in sys.stdin:
+    # Read raw bytes; the JSON parser decodes UTF-8 itself, so the text
+    # layer's per-line decode is skipped.
+    for line in sys.stdin.buffer:
         line = line.strip()
         if not line:
             continue
 
         try:
-            req = json.loads(line)
-        except json.JSONDecodeError as e:
+            req = _loads(line)
+        except ValueError as e:  # JSONDecodeError (json or orjson) or invalid UTF-8
             sys.stderr.write(f"Bad JSON: {e}\n")
             sys.stderr.flush()
             continue
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
+import json
 import logging
+import os
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal, Tuple
@@ -17,9 +23,15 @@ except ImportError:
     _HAS_PIL = False
 
 try:
-    import easyocr
     import numpy as np
 
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+try:
+    import easyocr
+
     _HAS_EASYOCR = True
 except ImportError:
     _HAS_EASYOCR = False
@@ -27,9 +39,20 @@ except ImportError:
 try:
     import pytesseract
 
-    _HAS_TESSERACT = True
+    _HAS_PYTESSERACT = True
+except ImportError:
+    _HAS_PYTESSERACT = False
+
+# Optional in-process Tesseract bindings: avoids pytesseract's
+# tesseract-CLI subprocess (and tessdata reload) on every field.
+try:
+    import tesserocr
+
+    _HAS_TESSEROCR = True
 except ImportError:
-    _HAS_TESSERACT = False
+    _HAS_TESSEROCR = False
+
+_HAS_TESSERACT = _HAS_TESSEROCR or _HAS_PYTESSERACT
 
 
 @dataclass
@@ -52,6 +75,35 @@ REGION_OK_BUTTON = (602, 371, 109, 62)
 OK_CLICK_TARGET = (590, 373)   # screenshot (659,408)
 OK_BRIGHTNESS_THRESHOLD = 0.30  # fraction of bright pixels to trigger detection
 
+# EasyOCR models keyed by gpu flag.  Loading one takes seconds, so they are
+# shared by every GameStateReader in the process and outlive env resets.
+_EASYOCR_READERS: dict[bool, "easyocr.Reader"] = {}
+_EASYOCR_LOCK = threading.Lock()  # a background warmup may be mid-construction
+
+
+def _shared_easyocr_reader(gpu: bool) -> "easyocr.Reader":
+    with _EASYOCR_LOCK:
+        reader = _EASYOCR_READERS.get(gpu)
+        if reader is None:
+            kwargs = {"cudnn_benchmark": True} if gpu else {}
+            reader = easyocr.Reader(["en"], gpu=gpu, verbose=False, **kwargs)
+            _EASYOCR_READERS[gpu] = reader
+        return reader
+
+
+# Digit extraction from OCR text.  A str.translate table would have to
+# enumerate every non-digit code point; the compiled pattern is exact.
+_NON_DIGIT_RE = re.compile(r"[^0-9]")
+_FIRST_NUMBER_RE = re.compile(r"(\d+)")
+
+# Tesseract binarization: bright HUD text -> black on white.  A 256-entry
+# table lets PIL apply it in C instead of calling a lambda per pixel.
+_THRESH_LUT = [0 if p > 160 else 255 for p in range(256)]
+
+# HUD crops repeat constantly (cash is unchanged between most actions), so OCR
+# results are memoized by (label, crop pixel digest).
+OCR_CACHE_SIZE = 256
+
 
 class GameStateReader:
     """Reads cash, lives, round, and detects OK dialog from a single screenshot."""
@@ -61,12 +113,20 @@ class GameStateReader:
         debug_dir: Path | None = None,
         backend: Literal["auto", "easyocr", "tesseract"] = "auto",
         easyocr_gpu: bool = False,
+        cache_dir: Path | None = None,
+        cache_tag: str = "",
+        recognize_only: bool = False,
     ):
         self._debug_dir = debug_dir
         self._seq = 0
         self._easyocr_gpu = easyocr_gpu
         self._easy_reader = None
+        self._tess_apis: dict[str, "tesserocr.PyTessBaseAPI"] = {}  # keyed by whitelist
+        self._use_tesserocr = _HAS_TESSEROCR  # cleared if its API fails to initialize
         self._warned_unavailable = False
+        self._crop_cache: OrderedDict[tuple[str, bytes], int | None] = OrderedDict()
+        self._cache_path: Path | None = None
+        self._recognize_only = recognize_only
 
         requested = (backend or "auto").lower()
         if requested not in {"auto", "easyocr", "tesseract"}:
@@ -74,6 +134,20 @@ class GameStateReader:
         self._requested_backend = requested
         self._resolved_backend = self._resolve_backend()
         logger.info("OCR backend requested=%s resolved=%s", self._requested_backend, self._resolved_backend)
+        if cache_dir is not None and self._resolved_backend != "none":
+            # Named after the backend actually in use (and the EasyOCR mode,
+            # whose readings can differ), so readers never share entries
+            # produced by a different OCR pipeline.
+            mode = self._resolved_backend
+            if mode == "easyocr" and recognize_only:
+                mode += "-recognize"
+            self._cache_path = Path(cache_dir) / f"{cache_tag}_{mode}.json"
+            self._load_cache()
+
+    @staticmethod
+    def has_easyocr() -> bool:
+        """True if EasyOCR and the image libraries it needs are importable."""
+        return _HAS_EASYOCR and _HAS_PIL and _HAS_NUMPY
 
     def _resolve_backend(self) -> str:
         if not _HAS_PIL:
@@ -91,19 +165,101 @@ class GameStateReader:
 
     def _get_easyocr_reader(self):
         if self._easy_reader is None:
-            self._easy_reader = easyocr.Reader(["en"], gpu=self._easyocr_gpu, verbose=False)
+            self._easy_reader = _shared_easyocr_reader(self._easyocr_gpu)
         return self._easy_reader
 
-    def _ocr_round_easyocr(self, crop: "Image.Image") -> tuple[int | None, "Image.Image"]:
-        """OCR the round region which shows e.g. '10 of 65' — return just the first number."""
+    def warmup(self) -> None:
+        """Load the OCR model and run one throwaway pass on a HUD-sized blank crop.
+
+        Moves model load and first-inference setup off the first real read.
+        """
+        if self._resolved_backend != "easyocr":
+            return
+        if self._easyocr_gpu in _EASYOCR_READERS:
+            return  # shared model already loaded and used by an earlier env
+        _, _, w, h = REGION_CASH
+        try:
+            self._get_easyocr_reader().readtext(
+                np.zeros((h, w, 3), dtype=np.uint8),
+                detail=1,
+                paragraph=False,
+                allowlist="0123456789$,",
+            )
+        except Exception as e:
+            logger.warning("OCR warmup failed: %s", e)
+
+    def close(self) -> None:
+        """Persist the crop cache (if configured) and release this reader's OCR handles.
+
+        In-process Tesseract APIs are ended; the shared EasyOCR model stays loaded.
+        """
+        self.save_cache()
+        self._easy_reader = None
+        for api in self._tess_apis.values():
+            api.End()
+        self._tess_apis.clear()
+
+    def _load_cache(self) -> None:
+        entries: OrderedDict[tuple[str, bytes], int | None] = OrderedDict()
+        try:
+            rows = json.loads(self._cache_path.read_text(encoding="utf-8"))
+            if not isinstance(rows, list):
+                raise ValueError(f"expected a list of rows, got {type(rows).__name__}")
+            for label, digest, value in rows[-OCR_CACHE_SIZE:]:
+                if not isinstance(label, str) or not (value is None or type(value) is int):
+                    raise ValueError(f"bad cache row {[label, digest, value]!r}")
+                entries[(label, bytes.fromhex(digest))] = value
+        except FileNotFoundError:
+            return
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Ignoring unreadable OCR cache %s: %s", self._cache_path, e)
+            return
+        self._crop_cache.update(entries)
+        logger.info("Loaded %d OCR cache entries from %s", len(self._crop_cache), self._cache_path)
+
+    def save_cache(self) -> None:
+        """Write the crop cache to cache_path, oldest entry first."""
+        if self._cache_path is None or not self._crop_cache:
+            return
+        rows = [[label, digest.hex(), value] for (label, digest), value in self._crop_cache.items()]
+        # Write a private temp file and rename it over the old one, so a
+        # concurrent run sharing the directory never sees a partial file.
+        tmp = self._cache_path.with_name(f"{self._cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(rows), encoding="utf-8")
+            os.replace(tmp, self._cache_path)
+        except OSError as e:
+            logger.warning("Could not save OCR cache %s: %s", self._cache_path, e)
+            tmp.unlink(missing_ok=True)
+
+    def _easyocr_read(self, arr: "np.ndarray", allowlist: str) -> list:
+        """Run EasyOCR on a HUD crop.
+
+        With recognize_only, the CRAFT detector is skipped and the whole crop is
+        handed to the recognizer as a single text box.
+        """
         reader = self._get_easyocr_reader()
-        arr = np.array(crop)
-        results = reader.readtext(
+        if self._recognize_only:
+            h, w = arr.shape[:2]
+            return reader.recognize(
+                arr,
+                horizontal_list=[[0, w, 0, h]],
+                free_list=[],
+                detail=1,
+                paragraph=False,
+                allowlist=allowlist,
+            )
+        return reader.readtext(
             arr,
             detail=1,
             paragraph=False,
-            allowlist="0123456789of ",
+            allowlist=allowlist,
         )
+
+    def _ocr_round_easyocr(self, crop: "Image.Image") -> tuple[int | None, "Image.Image"]:
+        """OCR the round region which shows e.g. '10 of 65' — return just the first number."""
+        results = self._easyocr_read(np.array(crop), "0123456789of ")
         if not results:
             logger.debug("EasyOCR [round] returned no text")
             return None, crop
@@ -112,24 +268,16 @@ class GameStateReader:
         logger.debug("EasyOCR [round] raw merged: %r", merged)
 
         # Extract first number (the current round) from "10 of 65"
-        m = re.search(r"(\d+)", merged)
+        m = _FIRST_NUMBER_RE.search(merged)
         if not m:
             logger.debug("EasyOCR [round] no digits in merged text: %r", merged)
             return None, crop
         return int(m.group(1)), crop
 
     def _ocr_crop_easyocr(self, crop: "Image.Image", label: str) -> tuple[int | None, "Image.Image"]:
-        reader = self._get_easyocr_reader()
-        arr = np.array(crop)
-
         # Raw crop in, modern recognizer handles stylized fonts better than
         # brittle manual thresholding for this HUD.
-        results = reader.readtext(
-            arr,
-            detail=1,
-            paragraph=False,
-            allowlist="0123456789$,",
-        )
+        results = self._easyocr_read(np.array(crop), "0123456789$,")
         if not results:
             logger.debug("EasyOCR [%s] returned no text", label)
             return None, crop
@@ -141,7 +289,7 @@ class GameStateReader:
                 continue
             text = str(row[1])
             conf = float(row[2]) if row[2] is not None else 0.0
-            digits = re.sub(r"[^0-9]", "", text)
+            digits = _NON_DIGIT_RE.sub("", text)
             if not digits:
                 continue
             score = (conf, len(digits))
@@ -151,7 +299,7 @@ class GameStateReader:
 
         if not best_digits:
             merged = "".join(str(row[1]) for row in results if len(row) >= 2)
-            merged_digits = re.sub(r"[^0-9]", "", merged)
+            merged_digits = _NON_DIGIT_RE.sub("", merged)
             if not merged_digits:
                 logger.debug("EasyOCR [%s] returned no digits from rows=%r", label, results)
                 return None, crop
@@ -159,17 +307,45 @@ class GameStateReader:
 
         return int(best_digits), crop
 
+    def _tess_api(self, whitelist: str) -> "tesserocr.PyTessBaseAPI | None":
+        """tesserocr API for this whitelist, or None to use pytesseract instead."""
+        if not self._use_tesserocr:
+            return None
+        api = self._tess_apis.get(whitelist)
+        if api is None:
+            try:
+                api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_LINE)
+            except RuntimeError as e:
+                # Typically a wheel built against a different tessdata prefix.
+                if not _HAS_PYTESSERACT:
+                    raise
+                logger.warning("tesserocr failed to initialize (%s); falling back to pytesseract", e)
+                self._use_tesserocr = False
+                return None
+            if whitelist:
+                api.SetVariable("tessedit_char_whitelist", whitelist)
+            self._tess_apis[whitelist] = api
+        return api
+
+    def _tesseract_text(self, img: "Image.Image", whitelist: str = "") -> str:
+        """Single-line Tesseract OCR, in-process via tesserocr when available."""
+        api = self._tess_api(whitelist)
+        if api is not None:
+            api.SetImage(img)
+            return api.GetUTF8Text()
+        config = "--psm 7"
+        if whitelist:
+            config += f" -c tessedit_char_whitelist={whitelist}"
+        return pytesseract.image_to_string(img, config=config)
+
     def _ocr_round_tesseract(self, crop: "Image.Image") -> tuple[int | None, "Image.Image"]:
         """Tesseract path for round region — parse first number from 'N of M'."""
         gray = crop.convert("L")
-        binary = gray.point(lambda p: 0 if p > 160 else 255)
-        scaled = binary.resize((binary.width * 4, binary.height * 4), Image.LANCZOS)
-        text = pytesseract.image_to_string(
-            scaled,
-            config="--psm 7",
-        )
+        binary = gray.point(_THRESH_LUT)
+        scaled = binary.resize((binary.width * 4, binary.height * 4), Image.NEAREST)
+        text = self._tesseract_text(scaled)
         logger.debug("Tesseract [round] raw text: %r", text)
-        m = re.search(r"(\d+)", text)
+        m = _FIRST_NUMBER_RE.search(text)
         if not m:
             logger.debug("Tesseract [round] no digits in text: %r", text)
             return None, scaled
@@ -179,14 +355,11 @@ class GameStateReader:
         gray = crop.convert("L")
 
         # Legacy fallback pipeline for Tesseract.
-        binary = gray.point(lambda p: 0 if p > 160 else 255)  # invert: dark text on white
-        scaled = binary.resize((binary.width * 4, binary.height * 4), Image.LANCZOS)
+        binary = gray.point(_THRESH_LUT)  # invert: dark text on white
+        scaled = binary.resize((binary.width * 4, binary.height * 4), Image.NEAREST)
 
-        text = pytesseract.image_to_string(
-            scaled,
-            config="--psm 7 -c tessedit_char_whitelist=0123456789$,",
-        )
-        digits = re.sub(r"[^0-9]", "", text)
+        text = self._tesseract_text(scaled, whitelist="0123456789$,")
+        digits = _NON_DIGIT_RE.sub("", text)
         if not digits:
             logger.debug("Tesseract [%s] returned no digits from text: %r", label, text)
             return None, scaled
@@ -199,11 +372,21 @@ class GameStateReader:
         cy: float,
         region: Tuple[int, int, int, int],
         label: str,
+        use_cache: bool = True,
     ) -> int | None:
-        """Crop a region from a full screenshot, preprocess, OCR, return int or None."""
+        """Crop a region from a full screenshot, preprocess, OCR, return int or None.
+
+        With use_cache=False the crop is always OCR'd; the fresh result still
+        replaces any cached one.
+        """
         rx, ry, rw, rh = region
         crop = full_img.crop((cx + rx, cy + ry, cx + rx + rw, cy + ry + rh))
 
+        key = (label, hashlib.blake2b(crop.tobytes(), digest_size=16).digest())
+        if use_cache and key in self._crop_cache:
+            self._crop_cache.move_to_end(key)
+            return self._crop_cache[key]
+
         guess: int | None = None
         proc = crop
         if label == "round":
@@ -222,6 +405,10 @@ class GameStateReader:
             crop.save(self._debug_dir / f"{label}_raw_{self._seq:04d}_{guess_tag}.png")
             proc.save(self._debug_dir / f"{label}_proc_{self._seq:04d}_{guess_tag}.png")
 
+        self._crop_cache[key] = guess
+        self._crop_cache.move_to_end(key)
+        if len(self._crop_cache) > OCR_CACHE_SIZE:
+            self._crop_cache.popitem(last=False)
         return guess
 
     def _detect_ok(
@@ -234,9 +421,13 @@ class GameStateReader:
         rx, ry, rw, rh = REGION_OK_BUTTON
         crop = full_img.crop((cx + rx, cy + ry, cx + rx + rw, cy + ry + rh))
         gray = crop.convert("L")
-        pixels = list(gray.getdata())
-        bright = sum(1 for p in pixels if p > 200)
-        ratio = bright / len(pixels) if pixels else 0
+        if _HAS_NUMPY:
+            arr = np.asarray(gray)
+            ratio = np.count_nonzero(arr > 200) / arr.size if arr.size else 0
+        else:
+            hist = gray.histogram()  # 256 bins, counted in C
+            total = gray.width * gray.height
+            ratio = sum(hist[201:]) / total if total else 0
         if ratio >= OK_BRIGHTNESS_THRESHOLD:
             logger.debug("OK button detected (bright ratio: %.2f)", ratio)
             return True
@@ -251,9 +442,59 @@ class GameStateReader:
 
         Returns (game_state, ok_button_visible).
         """
+        if not self._ready():
+            return GameState(), False
+        with Image.open(screenshot_path) as img:
+            return self._update_image(img, container_box)
+
+    def update_bytes(
+        self,
+        image_bytes: bytes,
+        container_box: dict,
+        use_cache: bool = True,
+    ) -> Tuple[GameState, bool]:
+        """Same as update(), but for an encoded screenshot already in memory.
+
+        Avoids a write/read round-trip through the filesystem when the caller
+        got the image straight from page.screenshot(). use_cache=False forces
+        a real OCR pass, bypassing the per-crop cache.
+        """
+        if not self._ready():
+            return GameState(), False
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            return self._update_image(img, container_box, use_cache)
+
+    def read_cash_bytes(
+        self,
+        image_bytes: bytes,
+        container_box: dict,
+    ) -> Tuple[int | None, bool]:
+        """Read only cash + OK-button visibility from an in-memory screenshot.
+
+        Cheaper than update_bytes() when lives and round are not needed.
+        Returns (cash, ok_button_visible).
+        """
+        if not self._ready():
+            return None, False
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            cx, cy = container_box["x"], container_box["y"]
+            cash = None
+            try:
+                cash = self._ocr_crop(img, cx, cy, REGION_CASH, "cash")
+            except Exception as e:
+                logger.warning("OCR [cash] failed: %s", e)
+            ok_visible = False
+            try:
+                ok_visible = self._detect_ok(img, cx, cy)
+            except Exception as e:
+                logger.warning("OK button detection failed: %s", e)
+        self._seq += 1
+        return cash, ok_visible
+
+    def _ready(self) -> bool:
         if not _HAS_PIL:
             logger.warning("Pillow not installed — OCR unavailable. Install with: pip install Pillow")
-            return GameState(), False
+            return False
         if self._resolved_backend == "none":
             if not self._warned_unavailable:
                 logger.warning(
@@ -262,9 +503,15 @@ class GameStateReader:
                     self._requested_backend,
                 )
                 self._warned_unavailable = True
-            return GameState(), False
+            return False
+        return True
 
-        img = Image.open(screenshot_path)
+    def _update_image(
+        self,
+        img: "Image.Image",
+        container_box: dict,
+        use_cache: bool = True,
+    ) -> Tuple[GameState, bool]:
         cx, cy = container_box["x"], container_box["y"]
 
         state = GameState()
@@ -274,7 +521,7 @@ class GameStateReader:
             ("round_num", REGION_ROUND, "round"),
         ]:
             try:
-                setattr(state, field, self._ocr_crop(img, cx, cy, region, label))
+                setattr(state, field, self._ocr_crop(img, cx, cy, region, label, use_cache))
             except Exception as e:
                 logger.warning("OCR [%s] failed: %s", label, e)
 
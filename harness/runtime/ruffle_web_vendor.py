@@ -5,8 +5,10 @@ Pinned by GitHub release tag (e.g. nightly-2026-02-09) for reproducibility.
 
 from __future__ import annotations
 
+import io
 import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -34,6 +36,25 @@ def _find_asset_url(release: dict, suffix: str) -> str:
     raise RuntimeError(f"No asset ending with {suffix} for release {release.get('tag_name')}")
 
 
+def _extract_parallel(z: zipfile.ZipFile, dest: Path, workers: int = 8) -> None:
+    # ZipFile serializes reads of the underlying file internally, so members
+    # can be extracted concurrently; the win is overlapping the per-file
+    # open/write/close syscalls. Directories are created up front because
+    # ZipFile.extract's own makedirs races between workers.
+    root = dest.resolve()
+    files = []
+    for info in z.infolist():
+        if info.is_dir():
+            z.extract(info, dest)
+            continue
+        parent = (dest / info.filename).parent.resolve()
+        if parent.is_relative_to(root):
+            parent.mkdir(parents=True, exist_ok=True)
+        files.append(info)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda info: z.extract(info, dest), files))
+
+
 def ensure_ruffle_web(
     repo_root: Path,
     tag: str = "nightly-2026-02-09",
@@ -53,17 +74,17 @@ def ensure_ruffle_web(
     release = _github_release_by_tag(tag)
     url = _find_asset_url(release, suffix="-web-selfhosted.zip")
 
-    zip_path = vendor_dir / "ruffle-web-selfhosted.zip"
-    with requests.get(url, stream=True, timeout=60) as r:
-        r.raise_for_status()
-        with open(zip_path, "wb") as f:
+    # Hold the archive (a few tens of MB) in memory and extract from there,
+    # instead of writing a .zip to disk first.
+    with io.BytesIO() as buf:
+        with requests.get(url, stream=True, timeout=60) as r:
+            r.raise_for_status()
             for chunk in r.iter_content(chunk_size=1024 * 1024):
                 if chunk:
-                    f.write(chunk)
-
-    with zipfile.ZipFile(zip_path, "r") as z:
-        z.extractall(vendor_dir)
-    zip_path.unlink(missing_ok=True)
+                    buf.write(chunk)
+        buf.seek(0)
+        with zipfile.ZipFile(buf, "r") as z:
+            _extract_parallel(z, vendor_dir)
 
     if not (vendor_dir / "ruffle.js").exists():
         candidates = list(vendor_dir.rglob("ruffle.js"))
@@ -1,11 +1,29 @@
 from __future__ import annotations
 
 import json
+import queue
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+_STOP = None  # queue sentinel
+_FLUSH_INTERVAL_S = 1.0  # max delay before a logged event reaches the file
+
+
+def _encode(evt: dict) -> bytes:
+    if _HAS_ORJSON:
+        return orjson.dumps(evt) + b"\n"
+    return (json.dumps(evt) + "\n").encode("utf-8")
+
 
 @dataclass
 class TraceLogger:
@@ -13,15 +31,42 @@ class TraceLogger:
 
     def __post_init__(self) -> None:
         self.run_dir.mkdir(parents=True, exist_ok=True)
-        self._fp = open(self.run_dir / "trace.jsonl", "a", encoding="utf-8")
+        self._fp = open(self.run_dir / "trace.jsonl", "ab", buffering=1 << 16)
+        # Lines are serialized by the caller and written by a background
+        # thread, so log() never blocks an action on file I/O.
+        self._q: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._drain, name="trace-writer", daemon=True)
+        self._writer.start()
+
+    def _drain(self) -> None:
+        # Flush at most once per interval while events keep coming, and
+        # within one interval of the logger going quiet.
+        pending = False
+        last_flush = time.monotonic()
+        while True:
+            try:
+                line = self._q.get(timeout=_FLUSH_INTERVAL_S)
+            except queue.Empty:
+                line = b""
+            if line is _STOP:
+                break
+            if line:
+                self._fp.write(line)
+                pending = True
+            if pending and (not line or time.monotonic() - last_flush >= _FLUSH_INTERVAL_S):
+                self._fp.flush()
+                pending = False
+                last_flush = time.monotonic()
+        self._fp.flush()
 
     def close(self) -> None:
         try:
+            self._q.put(_STOP)
+            self._writer.join()
             self._fp.close()
         except Exception:
             pass
 
     def log(self, op: str, **fields: Any) -> None:
         evt = {"t": time.time(), "op": op, **fields}
-        self._fp.write(json.dumps(evt) + "\n")
-        self._fp.flush()
+        self._q.put(_encode(evt))